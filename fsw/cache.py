@@ -0,0 +1,81 @@
+"""
+A small in-process cache whose entries expire after a time-to-live.
+"""
+
+import threading
+import time
+import typing
+
+
+class TimedCache:
+    """
+    A thread-safe mapping from hashable keys to values
+    which expire a fixed number of seconds after they are set.
+
+    The cache is local to the process,
+    so each worker process of the Flask app keeps its own copy.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        # The number of seconds after which each entry expires.
+        self.ttl = ttl
+
+        # The number of entries after which expired entries are pruned
+        # and, if the cache is still full, the oldest entry is evicted.
+        self.max_size = max_size
+
+        self._entries: dict[typing.Hashable, tuple[float, typing.Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """
+        Get the value for the key, or the default if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] < time.monotonic():
+            return default
+
+        return entry[1]
+
+    def set(self, key: typing.Hashable, value: typing.Any) -> None:
+        """
+        Set the value for the key.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items() if entry[0] >= now
+                }
+
+            if len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+
+            self._entries[key] = (now + self.ttl, value)
+
+    def get_or_set(
+        self,
+        key: typing.Hashable,
+        get_value: typing.Callable[[], typing.Any],
+    ) -> typing.Any:
+        """
+        Get the value for the key,
+        calling `get_value` and caching its result if the key is missing or expired.
+        """
+        missing = object()
+        value = self.get(key, missing)
+
+        if value is missing:
+            value = get_value()
+            self.set(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries = {}
@@ -0,0 +1,324 @@
+"""
+Validate many records against a form class at once.
+"""
+
+import copy
+import datetime
+import typing
+import weakref
+
+import wtforms
+
+from fsw.forms.choices import ForeignKeySelectField
+
+Record = typing.Mapping[str, typing.Any]
+Errors = dict[str, list[str]]
+
+# The datetime field types supported by validation plans,
+# each mapped to a function that converts parsed datetimes to field data.
+_DATETIME_FIELD_TYPES: dict[type, typing.Callable[[datetime.datetime], typing.Any]] = {
+    wtforms.DateTimeField: lambda value: value,
+    wtforms.DateTimeLocalField: lambda value: value,
+    wtforms.DateField: lambda value: value.date(),
+    wtforms.TimeField: lambda value: value.time(),
+}
+
+# The mutable types of field defaults, which are copied for each record.
+_MUTABLE_DATA_TYPES = (list, dict, set, bytearray)
+
+# The validation plans of each form class.
+_validation_plans: "weakref.WeakKeyDictionary[type, ValidationPlan]" = weakref.WeakKeyDictionary()
+
+
+class _RecordFormData:
+    """
+    A wrapper that gives a record the form data interface expected by WTForms.
+    """
+
+    def __init__(self, record: Record):
+        self.record = record
+
+    def __contains__(self, name: str) -> bool:
+        return self.record.get(name) is not None
+
+    def __iter__(self):
+        return iter(self.record)
+
+    def __len__(self) -> int:
+        return len(self.record)
+
+    def getlist(self, name: str) -> list:
+        return [self.record[name]]
+
+
+class _FieldPlan:
+    """
+    The precomputed steps to process and validate one field.
+    """
+
+    __slots__ = (
+        "name",
+        "empty_data",
+        "copy_empty_data",
+        "parse",
+        "parse_message",
+        "choice_field",
+        "choice_message",
+        "validators",
+    )
+
+    def __init__(self, name: str, field: wtforms.Field):
+        self.name = name
+        # The data of fields without submitted values, processed from the field default.
+        self.empty_data = False if type(field) is wtforms.BooleanField else field.data
+        self.copy_empty_data = isinstance(self.empty_data, _MUTABLE_DATA_TYPES)
+        self.parse, self.parse_message = _get_parse(field)
+
+        # Select fields, whose choices are loaded once for each batch.
+        self.choice_field: typing.Optional[wtforms.SelectField] = None
+        self.choice_message = field.gettext("Not a valid choice.")
+
+        if isinstance(field, wtforms.SelectField) and field.validate_choice:
+            self.choice_field = field
+
+        self.validators = [_get_validator_step(field, validator) for validator in field.validators]
+
+    def get_check_choice(self) -> typing.Optional[typing.Callable[[typing.Any], bool]]:
+        """
+        Get a function that checks whether data matches a choice of the field.
+        """
+        field = self.choice_field
+
+        if field is None:
+            return None
+
+        if isinstance(field, ForeignKeySelectField):
+            choices = field.choice_loader.get_choices()
+
+            if choices is None:
+                blank_choice = field.blank_choice
+                get_choice = field.choice_loader.get_choice
+
+                return lambda data: (
+                    blank_choice if data is None else get_choice(data) is not None
+                )
+        elif isinstance(field.choices, dict):
+            choices = [choice for group in field.choices.values() for choice in group]
+        else:
+            choices = field.choices or []
+
+        choices = [
+            choice if isinstance(choice, (list, tuple)) else (choice,) for choice in choices
+        ]
+        choice_values = {field.coerce(choice[0]) for choice in choices}
+
+        if isinstance(field, ForeignKeySelectField) and field.blank_choice:
+            choice_values.add(None)
+
+        return choice_values.__contains__
+
+
+def _get_parse(field: wtforms.Field) -> tuple[typing.Optional[typing.Callable], str]:
+    """
+    Get the function that parses submitted values to field data,
+    and the error message if a value cannot be parsed.
+    """
+    field_type = type(field)
+
+    if field_type is wtforms.StringField:
+        return None, ""
+
+    if field_type is wtforms.IntegerField:
+        return int, field.gettext("Not a valid integer value.")
+
+    if field_type is wtforms.BooleanField:
+        false_values = field.false_values
+        return (lambda value: value not in false_values), ""
+
+    if field_type in _DATETIME_FIELD_TYPES:
+        convert = _DATETIME_FIELD_TYPES[field_type]
+        formats = field.strptime_format
+
+        def parse(value):
+            for format in formats:
+                try:
+                    return convert(datetime.datetime.strptime(value, format))
+                except ValueError:
+                    pass
+
+            raise ValueError
+
+        message = {
+            wtforms.DateField: "Not a valid date value.",
+            wtforms.TimeField: "Not a valid time value.",
+        }.get(field_type, "Not a valid datetime value.")
+
+        return parse, field.gettext(message)
+
+    if field_type in (wtforms.SelectField, ForeignKeySelectField):
+        return field.coerce, field.gettext("Invalid Choice: could not coerce.")
+
+    raise NotImplementedError
+
+
+def _get_validator_step(field: wtforms.Field, validator) -> tuple:
+    """
+    Get the precomputed step for a validator of the field.
+    """
+    validator_type = type(validator)
+
+    if validator_type is wtforms.validators.InputRequired:
+        return ("required", validator.message or field.gettext("This field is required."))
+
+    if validator_type is wtforms.validators.Optional:
+        return ("optional", validator.string_check)
+
+    if validator_type is wtforms.validators.Length:
+        minimum, maximum = validator.min, validator.max
+
+        if validator.message is not None:
+            message = validator.message
+        elif maximum == -1:
+            message = field.ngettext(
+                "Field must be at least %(min)d character long.",
+                "Field must be at least %(min)d characters long.",
+                minimum,
+            )
+        elif minimum == -1:
+            message = field.ngettext(
+                "Field cannot be longer than %(max)d character.",
+                "Field cannot be longer than %(max)d characters.",
+                maximum,
+            )
+        elif minimum == maximum:
+            message = field.ngettext(
+                "Field must be exactly %(max)d character long.",
+                "Field must be exactly %(max)d characters long.",
+                maximum,
+            )
+        else:
+            message = field.gettext("Field must be between %(min)d and %(max)d characters long.")
+
+        return ("length", minimum, maximum, message)
+
+    raise NotImplementedError
+
+
+class ValidationPlan:
+    """
+    A plan to validate many records against a form class,
+    precomputed once from the fields and validators of the form.
+
+    Records map field names to submitted values, as in form data,
+    and missing values and `None` are not submitted.
+    The data and errors of each record are the same as `form.data` and `form.errors`
+    of the form submitted with the record.
+
+    The plan supports the fields and validators created by `ModelFormMixin`.
+    Forms with other fields or validators, field filters, inline validators or filters,
+    callable defaults, defaults that fail processing, or an overridden `validate` method
+    are validated by instantiating the form for each record instead.
+    """
+
+    def __init__(self, form_class: typing.Type[wtforms.Form]):
+        self.form_class = form_class
+
+        form = form_class(meta={"csrf": False})
+        self.field_plans: typing.Optional[list[_FieldPlan]] = None
+
+        if form_class.validate is not wtforms.Form.validate:
+            return
+
+        for name, field in form._fields.items():
+            # Callable defaults are called again for each form, so they cannot be precomputed.
+            if field.filters or field.process_errors or callable(field.default):
+                return
+
+            if hasattr(form_class, f"validate_{name}") or hasattr(form_class, f"filter_{name}"):
+                return
+
+        try:
+            self.field_plans = [_FieldPlan(name, field) for name, field in form._fields.items()]
+        except NotImplementedError:
+            pass
+
+    def _validate_form(self, record: Record) -> tuple[dict, Errors]:
+        form = self.form_class(_RecordFormData(record), meta={"csrf": False})
+        form.validate()
+
+        return form.data, form.errors
+
+    def validate(self, records: typing.Iterable[Record]) -> list[tuple[dict, Errors]]:
+        """
+        Validate the records, and get the data and errors of each record.
+        """
+        if self.field_plans is None:
+            return [self._validate_form(record) for record in records]
+
+        field_steps = [
+            (field_plan, field_plan.get_check_choice()) for field_plan in self.field_plans
+        ]
+        results = []
+
+        for record in records:
+            data = {}
+            errors: Errors = {}
+
+            for field_plan, check_choice in field_steps:
+                name = field_plan.name
+                value = record.get(name)
+                field_errors = []
+
+                if value is None:
+                    field_data = field_plan.empty_data
+
+                    if field_plan.copy_empty_data:
+                        field_data = copy.copy(field_data)
+                elif field_plan.parse is None:
+                    field_data = value
+                else:
+                    try:
+                        field_data = field_plan.parse(value)
+                    except ValueError:
+                        field_data = None
+                        field_errors.append(field_plan.parse_message)
+
+                if check_choice is not None and not check_choice(field_data):
+                    field_errors.append(field_plan.choice_message)
+
+                for step in field_plan.validators:
+                    if step[0] == "required":
+                        if not value:
+                            field_errors = [step[1]]
+                            break
+                    elif step[0] == "optional":
+                        if value is None or isinstance(value, str) and not step[1](value):
+                            field_errors = []
+                            break
+                    else:
+                        _, minimum, maximum, message = step
+                        length = field_data and len(field_data) or 0
+
+                        if length < minimum or maximum != -1 and length > maximum:
+                            field_errors.append(
+                                message % {"min": minimum, "max": maximum, "length": length}
+                            )
+
+                data[name] = field_data
+
+                if field_errors:
+                    errors[name] = field_errors
+
+            results.append((data, errors))
+
+        return results
+
+
+def get_validation_plan(form_class: typing.Type[wtforms.Form]) -> ValidationPlan:
+    """
+    Get the validation plan of the form class, precomputing it on the first call.
+    """
+    if form_class not in _validation_plans:
+        _validation_plans[form_class] = ValidationPlan(form_class)
+
+    return _validation_plans[form_class]
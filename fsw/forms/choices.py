@@ -0,0 +1,231 @@
+"""
+Load and cache the choices of fields for foreign-key columns.
+"""
+
+import typing
+import weakref
+
+import sqlalchemy
+import sqlalchemy.orm
+import wtforms
+
+from fsw.cache import TimedCache
+
+Choice = tuple[typing.Any, str]
+
+# The choice loaders that currently exist, used to invalidate their caches
+# when the tables from which they load choices are written.
+_choice_loaders: "weakref.WeakSet[ForeignKeyChoiceLoader]" = weakref.WeakSet()
+
+# The key of the session info that holds the tables written in the current transaction.
+_WRITTEN_TABLES_KEY = "fsw_written_tables"
+
+
+class ForeignKeyChoiceLoader:
+    """
+    A loader of `(value, label)` choices
+    from the table referenced by a foreign-key column.
+
+    Choices are loaded with a query that selects only the value and label columns,
+    and are cached until the TTL passes or a session commits a write to the table.
+    If the table has more rows than `max_choices`,
+    the loader does not load every row, and fields should search for choices instead.
+    """
+
+    def __init__(
+        self,
+        database_session: sqlalchemy.orm.scoped_session,
+        value_column: sqlalchemy.Column,
+        label_column: sqlalchemy.Column,
+        ttl: float = 60,
+        max_choices: int = 500,
+        page_size: int = 20,
+    ):
+        self.database_session = database_session
+        self.value_column = value_column
+        self.label_column = label_column
+        self.max_choices = max_choices
+        self.page_size = page_size
+
+        self.table = value_column.table
+        self.cache = TimedCache(ttl)
+
+        _choice_loaders.add(self)
+
+    def _select(self) -> sqlalchemy.Select:
+        return sqlalchemy.select(self.value_column, self.label_column)
+
+    def _load_choices(self) -> typing.Optional[list[Choice]]:
+        statement = self._select().order_by(self.label_column).limit(self.max_choices + 1)
+        choices = [
+            (value, str(label)) for value, label in self.database_session.execute(statement)
+        ]
+
+        if len(choices) > self.max_choices:
+            return None
+
+        return choices
+
+    def get_choices(self) -> typing.Optional[list[Choice]]:
+        """
+        Get every choice,
+        or `None` if the table has too many rows to load every choice.
+        """
+        return self.cache.get_or_set("choices", self._load_choices)
+
+    def _load_choice(self, value) -> typing.Optional[Choice]:
+        statement = self._select().where(self.value_column == value)
+        row = self.database_session.execute(statement).first()
+
+        if row is None:
+            return None
+
+        return (row[0], str(row[1]))
+
+    def get_choice(self, value) -> typing.Optional[Choice]:
+        """
+        Get the choice for one value, or `None` if no row has the value.
+        """
+        return self.cache.get_or_set(("choice", value), lambda: self._load_choice(value))
+
+    def _load_search(self, term: str, page: int) -> list[Choice]:
+        # Escape the search term so that `%` and `_` do not act as wildcards.
+        label = sqlalchemy.cast(self.label_column, sqlalchemy.String)
+        statement = (
+            self._select()
+            .where(label.icontains(term, autoescape=True))
+            .order_by(self.label_column)
+            .limit(self.page_size)
+            .offset(page * self.page_size)
+        )
+
+        return [(value, str(label)) for value, label in self.database_session.execute(statement)]
+
+    def search(self, term: str = "", page: int = 0) -> list[Choice]:
+        """
+        Get one page of the choices whose labels contain the search term.
+
+        Views can return these choices to autocomplete inputs
+        for tables too large to load every choice.
+        """
+        return self.cache.get_or_set(
+            ("search", term, page),
+            lambda: self._load_search(term, page),
+        )
+
+    def invalidate(self) -> None:
+        """
+        Clear the cached choices.
+        """
+        self.cache.clear()
+
+
+class ForeignKeySelectField(wtforms.SelectField):
+    """
+    A select field whose choices are loaded from a foreign-key choice loader.
+
+    If the loader has too many rows to load every choice,
+    the field only renders the choice for its current value,
+    and checks submitted values against the table with one query each.
+    """
+
+    def __init__(
+        self,
+        label=None,
+        validators=None,
+        choice_loader: typing.Optional[ForeignKeyChoiceLoader] = None,
+        blank_choice: bool = False,
+        **kwargs,
+    ):
+        super().__init__(label, validators, **kwargs)
+
+        if choice_loader is None:
+            raise TypeError("A foreign-key select field requires a choice loader.")
+
+        self.choice_loader = choice_loader
+        self.blank_choice = blank_choice
+
+        choices = choice_loader.get_choices()
+        self.is_searched = choices is None
+        self.choices = self._get_blank_choices() + (choices or [])
+
+    def _get_blank_choices(self) -> list[Choice]:
+        return [("", "")] if self.blank_choice else []
+
+    def process(self, formdata, data=wtforms.utils.unset_value, extra_filters=None):
+        super().process(formdata, data, extra_filters)
+
+        if self.is_searched and self.data is not None:
+            choice = self.choice_loader.get_choice(self.data)
+            self.choices = self._get_blank_choices() + ([choice] if choice else [])
+
+    def pre_validate(self, form):
+        if not self.is_searched:
+            return super().pre_validate(form)
+
+        if self.data is None:
+            if not self.blank_choice:
+                raise wtforms.validators.ValidationError(self.gettext("Not a valid choice."))
+
+            return
+
+        if self.choice_loader.get_choice(self.data) is None:
+            raise wtforms.validators.ValidationError(self.gettext("Not a valid choice."))
+
+
+def get_optional_coerce(python_type: type) -> typing.Callable:
+    """
+    Get a function that coerces submitted values to the Python type,
+    and coerces the blank value to `None`.
+    """
+
+    def coerce(value):
+        if value is None or value == "":
+            return None
+
+        if isinstance(value, python_type):
+            return value
+
+        return python_type(value)
+
+    return coerce
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_flush")
+def _record_flushed_tables(session, flush_context) -> None:
+    if not _choice_loaders:
+        return
+
+    written_tables = session.info.setdefault(_WRITTEN_TABLES_KEY, set())
+
+    for instance in [*session.new, *session.dirty, *session.deleted]:
+        written_tables.update(sqlalchemy.inspect(instance).mapper.tables)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "do_orm_execute")
+def _record_executed_tables(orm_execute_state) -> None:
+    if not _choice_loaders:
+        return
+
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+
+        if table is not None:
+            orm_execute_state.session.info.setdefault(_WRITTEN_TABLES_KEY, set()).add(table)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_commit")
+def _invalidate_written_tables(session) -> None:
+    written_tables = session.info.pop(_WRITTEN_TABLES_KEY, None)
+
+    if not written_tables:
+        return
+
+    for choice_loader in list(_choice_loaders):
+        if choice_loader.table in written_tables:
+            choice_loader.invalidate()
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_rollback")
+def _discard_written_tables(session) -> None:
+    session.info.pop(_WRITTEN_TABLES_KEY, None)
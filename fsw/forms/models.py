@@ -3,14 +3,24 @@ Convert SQLAlchemy model classes to WTForms form classes.
 """
 
 import typing
+import weakref
 
 import sqlalchemy
+import sqlalchemy.orm
 import wtforms
 
+from fsw.forms.batch import get_validation_plan
+from fsw.forms.choices import ForeignKeyChoiceLoader
+from fsw.forms.choices import ForeignKeySelectField
+from fsw.forms.choices import get_optional_coerce
+
 FormType = typing.Type[wtforms.Form]
 FieldType = typing.Type[wtforms.Field]
 FieldKwargs = dict[str, typing.Any]
 
+# The form classes created by `ModelFormMixin.get_model_form`, used to warm up the app.
+_model_forms: "weakref.WeakSet[FormType]" = weakref.WeakSet()
+
 
 class ColumnFieldConverter:
     """
@@ -92,21 +102,213 @@ class EnumColumnFieldConverter(ColumnFieldConverter):
         return field_kwargs
 
 
+class ForeignKeyColumnFieldConverter(ColumnFieldConverter):
+    """
+    A converter from foreign-key columns to select fields
+    with choices loaded from the referenced table.
+
+    The label of each choice is the `label_name` column of the referenced table,
+    or the referenced column itself if the table has no such column.
+    Choices are cached for `ttl` seconds or until a write to the table is committed.
+    Referenced tables with more than `max_choices` rows
+    are not loaded in full; use the `search` method of the field choice loader instead.
+    """
+
+    def __init__(
+        self,
+        database_session: sqlalchemy.orm.scoped_session,
+        label_name: str = "name",
+        ttl: float = 60,
+        max_choices: int = 500,
+    ):
+        self.database_session = database_session
+        self.label_name = label_name
+        self.ttl = ttl
+        self.max_choices = max_choices
+
+        self.choice_loaders: dict[sqlalchemy.Column, ForeignKeyChoiceLoader] = {}
+
+    def get_choice_loader(self, column: sqlalchemy.Column) -> ForeignKeyChoiceLoader:
+        """
+        Get the choice loader for the table referenced by the column.
+        """
+        try:
+            (foreign_key,) = column.foreign_keys
+        except ValueError:
+            raise ValueError(
+                f"The column `{column.name}` must have exactly one foreign key"
+                " to be converted to a foreign-key field."
+            )
+
+        value_column = foreign_key.column
+
+        if value_column not in self.choice_loaders:
+            self.choice_loaders[value_column] = ForeignKeyChoiceLoader(
+                self.database_session,
+                value_column,
+                value_column.table.columns.get(self.label_name, value_column),
+                ttl=self.ttl,
+                max_choices=self.max_choices,
+            )
+
+        return self.choice_loaders[value_column]
+
+    def get_field_type(self, column: sqlalchemy.Column) -> FieldType:
+        return ForeignKeySelectField
+
+    def get_field_kwargs(self, column: sqlalchemy.Column) -> FieldKwargs:
+        field_kwargs = super().get_field_kwargs(column)
+        field_kwargs["choice_loader"] = self.get_choice_loader(column)
+        field_kwargs["blank_choice"] = column.nullable
+
+        try:
+            field_kwargs["coerce"] = get_optional_coerce(column.type.python_type)
+        except NotImplementedError:
+            field_kwargs["coerce"] = get_optional_coerce(str)
+
+        return field_kwargs
+
+
+class ColumnFieldConverterRegistry(dict):
+    """
+    A mapping from SQLAlchemy column types to converters,
+    which resolves column types through their MRO
+    so that subclasses such as `Text`, `BigInteger`, and dialect types
+    use the converter of their nearest registered base type.
+    Unregistered `TypeDecorator` types resolve through the type they decorate.
+
+    Resolved converters are memoized for each column type
+    until the registry is changed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolved_converters: dict[typing.Type, ColumnFieldConverter] = {}
+
+    def __setitem__(self, column_type: typing.Type, converter: ColumnFieldConverter) -> None:
+        super().__setitem__(column_type, converter)
+        self._resolved_converters = {}
+
+    def __delitem__(self, column_type: typing.Type) -> None:
+        super().__delitem__(column_type)
+        self._resolved_converters = {}
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._resolved_converters = {}
+
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._resolved_converters = {}
+
+    def setdefault(self, column_type: typing.Type, converter: ColumnFieldConverter):
+        converter = super().setdefault(column_type, converter)
+        self._resolved_converters = {}
+
+        return converter
+
+    def pop(self, *args):
+        converter = super().pop(*args)
+        self._resolved_converters = {}
+
+        return converter
+
+    def popitem(self):
+        item = super().popitem()
+        self._resolved_converters = {}
+
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._resolved_converters = {}
+
+    def resolve(self, column_type: typing.Type) -> ColumnFieldConverter:
+        """
+        Get the converter for the column type or its nearest registered base type,
+        or for the decorated type of an unregistered `TypeDecorator` type.
+        """
+        try:
+            return self._resolved_converters[column_type]
+        except KeyError:
+            pass
+
+        for base_type in column_type.__mro__:
+            if base_type in self:
+                converter = self[base_type]
+                break
+        else:
+            if issubclass(column_type, sqlalchemy.types.TypeDecorator):
+                impl = column_type.impl
+                converter = self.resolve(impl if isinstance(impl, type) else type(impl))
+                self._resolved_converters[column_type] = converter
+
+                return converter
+
+            raise KeyError(
+                "No converter currently exists"
+                f" for SQLAlchemy columns of the type `{column_type}`."
+            )
+
+        self._resolved_converters[column_type] = converter
+
+        return converter
+
+
+def get_model_forms() -> list[FormType]:
+    """
+    Get the form classes created by `ModelFormMixin.get_model_form` that still exist.
+    """
+    return list(_model_forms)
+
+
 class ModelFormMixin:
     """
     A mixin that adds a `get_model_form` class method to the form class,
     which returns a class with fields matching the columns of the model.
+
+    Subclasses can set `converters` to a dictionary,
+    which is wrapped in a converter registry when the subclass is created.
     """
 
-    converters: dict[typing.Type, ColumnFieldConverter] = {
-        sqlalchemy.types.String: StringColumnFieldConverter(),
-        sqlalchemy.types.Integer: IntegerColumnFieldConverter(),
-        sqlalchemy.types.DateTime: DateTimeColumnFieldConverter(),
-        sqlalchemy.types.Date: DateColumnFieldConverter(),
-        sqlalchemy.types.Time: TimeColumnFieldConverter(),
-        sqlalchemy.types.Boolean: BooleanColumnFieldConverter(),
-        sqlalchemy.types.Enum: EnumColumnFieldConverter(),
-    }
+    converters: ColumnFieldConverterRegistry = ColumnFieldConverterRegistry(
+        {
+            sqlalchemy.types.String: StringColumnFieldConverter(),
+            sqlalchemy.types.Integer: IntegerColumnFieldConverter(),
+            sqlalchemy.types.DateTime: DateTimeColumnFieldConverter(),
+            sqlalchemy.types.Date: DateColumnFieldConverter(),
+            sqlalchemy.types.Time: TimeColumnFieldConverter(),
+            sqlalchemy.types.Boolean: BooleanColumnFieldConverter(),
+            sqlalchemy.types.Enum: EnumColumnFieldConverter(),
+        }
+    )
+
+    # The converter for foreign-key columns, which requires the database session.
+    # If this converter is not set, foreign-key columns are converted by their type.
+    foreign_key_converter: typing.Optional[ColumnFieldConverter] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        converters = cls.__dict__.get("converters")
+
+        if converters is not None and not isinstance(converters, ColumnFieldConverterRegistry):
+            cls.converters = ColumnFieldConverterRegistry(converters)
+
+    @classmethod
+    def validate_records(
+        cls,
+        records: typing.Iterable[typing.Mapping[str, typing.Any]],
+    ) -> list[tuple[dict, dict[str, list[str]]]]:
+        """
+        Validate many records against this form class at once,
+        and get the data and errors of each record.
+
+        The validation plan of the form class is precomputed on the first call.
+        """
+        return get_validation_plan(cls).validate(records)
 
     @classmethod
     def get_model_form(
@@ -137,21 +339,19 @@ class ModelFormMixin:
                     f" of the SQLAlchemy model `{model.__name__}`."
                 )
 
-            try:
-                converter = cls.converters[type(column.type)]
-            except KeyError:
-                raise KeyError(
-                    "No converter currently exists"
-                    f" for SQLAlchemy columns of the type `{type(column.type)}`."
-                )
-
             # Check whether this column has a custom converter.
             if name in column_converters:
                 converter = column_converters[name]
+            elif column.foreign_keys and cls.foreign_key_converter is not None:
+                converter = cls.foreign_key_converter
+            else:
+                converter = cls.converters.resolve(type(column.type))
 
             field_type = converter.get_field_type(column)
             field_kwargs = converter.get_field_kwargs(column)
 
             setattr(ModelForm, name, field_type(**field_kwargs))
 
+        _model_forms.add(ModelForm)
+
         return ModelForm
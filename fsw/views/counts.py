@@ -0,0 +1,158 @@
+"""
+A mixin that counts the model instances of listings, for pagination.
+"""
+
+import json
+import math
+import typing
+
+import sqlalchemy
+import sqlalchemy.ext.compiler
+import sqlalchemy.orm
+
+from fsw.cache import TimedCache
+
+# The count caches of each view class.
+_count_caches: dict[type, TimedCache] = {}
+
+
+class _Explain(sqlalchemy.sql.expression.Executable, sqlalchemy.sql.expression.ClauseElement):
+    """
+    A PostgreSQL `EXPLAIN (FORMAT JSON)` statement for a select statement,
+    whose parameters are bound by the dialect like those of the select statement.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, select: sqlalchemy.Select):
+        self.select = select
+
+
+@sqlalchemy.ext.compiler.compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.select, **kwargs)
+
+
+class ModelCount(typing.NamedTuple):
+    """
+    The count of the model instances of a listing.
+
+    If the count is not exact, it is a lower bound (such as "10,000+")
+    for capped counts, or an approximation for estimated counts.
+    """
+
+    value: int
+    is_exact: bool
+
+
+class ModelCountViewMixin:
+    """
+    A mixin for views that count the model instances of the filtered select statement.
+
+    The `count_mode` of the view selects how model instances are counted:
+
+    - `"exact"` counts every model instance.
+    - `"capped"` stops counting after `count_cap` model instances.
+    - `"estimated"` uses the query planner estimate of the database if it provides one,
+      counting exactly if the estimate does not exceed `count_cap`,
+      and otherwise falls back to the capped count (such as for SQLite).
+
+    Counts are cached for `count_cache_ttl` seconds for each filtered select statement.
+    """
+
+    # The SQLAlchemy database session.
+    database_session: sqlalchemy.orm.scoped_session
+
+    # The mode with which to count model instances, or `None` to not count them.
+    count_mode: typing.Optional[str] = None
+
+    # The number of model instances after which capped counts stop.
+    count_cap: int = 10_000
+
+    # The number of seconds for which counts are cached.
+    count_cache_ttl: float = 10
+
+    def get_model_select(self) -> sqlalchemy.Select:
+        """
+        Get the select statement for the model instances to count.
+        """
+        raise NotImplementedError
+
+    def _get_count_cache(self) -> TimedCache:
+        view_class = type(self)
+
+        if view_class not in _count_caches:
+            _count_caches[view_class] = TimedCache(self.count_cache_ttl)
+
+        return _count_caches[view_class]
+
+    def _count_exact(self, select: sqlalchemy.Select) -> ModelCount:
+        count_select = sqlalchemy.select(sqlalchemy.func.count()).select_from(select.subquery())
+
+        return ModelCount(self.database_session.scalar(count_select), True)
+
+    def _count_capped(self, select: sqlalchemy.Select) -> ModelCount:
+        count_select = sqlalchemy.select(sqlalchemy.func.count()).select_from(
+            select.limit(self.count_cap + 1).subquery()
+        )
+        value = self.database_session.scalar(count_select)
+
+        if value > self.count_cap:
+            return ModelCount(self.count_cap, False)
+
+        return ModelCount(value, True)
+
+    def _count_estimated(self, select: sqlalchemy.Select) -> ModelCount:
+        connection = self.database_session.connection()
+
+        if connection.dialect.name != "postgresql":
+            return self._count_capped(select)
+
+        plan = connection.execute(_Explain(select)).scalar()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        value = int(plan[0]["Plan"]["Plan Rows"])
+
+        if value <= self.count_cap:
+            return self._count_exact(select)
+
+        return ModelCount(value, False)
+
+    def get_model_count(self) -> typing.Optional[ModelCount]:
+        """
+        Count the model instances with the count mode of the view,
+        or return `None` if the view does not count model instances.
+        """
+        count_functions = {
+            "exact": self._count_exact,
+            "capped": self._count_capped,
+            "estimated": self._count_estimated,
+        }
+
+        if self.count_mode is None:
+            return None
+
+        if self.count_mode not in count_functions:
+            raise ValueError(f"The count mode `{self.count_mode}` does not exist.")
+
+        # The order of the model instances does not affect the count.
+        select = self.get_model_select().order_by(None)
+        compiled = select.compile(dialect=self.database_session.get_bind().dialect)
+        key = (
+            self.count_mode,
+            str(compiled),
+            tuple(sorted((name, repr(value)) for name, value in compiled.params.items())),
+        )
+
+        return self._get_count_cache().get_or_set(
+            key,
+            lambda: count_functions[self.count_mode](select),
+        )
+
+    def get_page_count(self, model_count: ModelCount, page_size: int) -> int:
+        """
+        Get the number of pages needed for the counted model instances.
+        """
+        return max(1, math.ceil(model_count.value / page_size))
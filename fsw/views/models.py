@@ -8,7 +8,10 @@ import flask.views
 import sqlalchemy.orm
 import wtforms
 
+from fsw.views.counts import ModelCount
+from fsw.views.counts import ModelCountViewMixin
 from fsw.views.forms import FormView
+from fsw.views.queries import ModelQueryViewMixin
 from fsw.views.redirects import RedirectView
 from fsw.views.templates import TemplateView
 
@@ -59,25 +62,58 @@ class OneModelInstanceViewMixin(ModelViewMixin):
         raise NotImplementedError
 
 
-class ReadModelView(ModelInstanceViewMixin, TemplateView):
+class ReadModelView(
+    ModelInstanceViewMixin,
+    ModelQueryViewMixin,
+    ModelCountViewMixin,
+    TemplateView,
+):
     """
     A view that reads model instances.
+
+    By default, the model instances are selected with the declared filters and sorts,
+    and limited to the requested page if the view paginates.
     """
 
+    # The count of the model instances for the current request, if the view counts them.
+    # When rendering templates with Jinja, the count is accessible
+    # as the context variable `model_count`, along with `page` and `page_count`
+    # if the view paginates.
+    request_model_count: typing.Optional[ModelCount]
+
+    def get_model_instances(self) -> list:
+        """
+        Get the filtered and sorted model instances on the requested page.
+        """
+        select = self.get_page_select(self.get_model_select())
+
+        return list(self.database_session.scalars(select))
+
     def get_template_context(self) -> dict:
         """
-        Add the model instances to the template context.
+        Add the model instances and their count to the template context.
         """
         template_context = TemplateView.get_template_context(self)
         template_context["model_instances"] = self.request_model_instances
 
+        if self.request_model_count is not None:
+            template_context["model_count"] = self.request_model_count
+
+            if self.page_size is not None:
+                template_context["page"] = self.get_page()
+                template_context["page_count"] = self.get_page_count(
+                    self.request_model_count,
+                    self.page_size,
+                )
+
         return template_context
 
     def dispatch_request(self, **kwargs):
         """
-        Get the model instances and dispatch the request.
+        Get the model instances and their count and dispatch the request.
         """
         self.request_model_instances = self.get_model_instances()
+        self.request_model_count = self.get_model_count()
 
         return TemplateView.dispatch_request(self)
 
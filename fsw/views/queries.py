@@ -0,0 +1,240 @@
+"""
+A mixin that filters and sorts model instances with request query arguments.
+"""
+
+import datetime
+import decimal
+import typing
+import warnings
+
+import flask
+import sqlalchemy
+
+# The operators with which columns can be filtered,
+# each of which is the suffix of a query argument, such as `title__contains`.
+OPERATORS: dict[str, typing.Callable[[sqlalchemy.Column, typing.Any], typing.Any]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "le": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "ge": lambda column, value: column >= value,
+    "in": lambda column, values: column.in_(values),
+    "contains": lambda column, value: column.icontains(value, autoescape=True),
+    "startswith": lambda column, value: column.istartswith(value, autoescape=True),
+}
+
+# The separator between a column name and an operator in a query argument.
+OPERATOR_SEPARATOR = "__"
+
+# The view classes whose filter and sort columns have been checked for indexes.
+_index_checked_view_classes: set[type] = set()
+
+
+def is_column_indexed(column: sqlalchemy.Column) -> bool:
+    """
+    Check whether the column is the first column of an index of its table.
+    """
+    if column.primary_key or column.index or column.unique:
+        return True
+
+    table = column.table
+    constraints = [*table.indexes, *table.constraints]
+
+    return any(
+        isinstance(constraint, (sqlalchemy.Index, sqlalchemy.UniqueConstraint))
+        and next(iter(constraint.columns), None) is column
+        for constraint in constraints
+    )
+
+
+class ModelQueryViewMixin:
+    """
+    A mixin for views that filter and sort model instances
+    with the query arguments of the request, compiled to one SQL statement.
+
+    Filter query arguments have the form `name=value` or `name__operator=value`,
+    and the `in` operator accepts comma-separated values.
+    The sort query argument has the form `sort=name,-other_name`,
+    where a leading `-` sorts in descending order.
+    The page query argument has the form `page=2` and is one-based.
+    Names, operators, and values that are not allowed abort the request with status 400.
+
+    In debug mode, a warning is emitted for each filter or sort column without an index.
+    """
+
+    # The model class.
+    model: type
+
+    # The filterable column names, each mapped to the names of its allowed operators.
+    filter_fields: dict[str, list[str]] = {}
+
+    # The sortable column names.
+    sort_fields: list[str] = []
+
+    # The sort applied if the request has no sort query argument.
+    default_sort: list[str] = []
+
+    # The name of the sort query argument.
+    sort_argument: str = "sort"
+
+    # The number of model instances on each page, or `None` to not paginate.
+    page_size: typing.Optional[int] = None
+
+    # The name of the one-based page query argument.
+    page_argument: str = "page"
+
+    def get_model_columns(self) -> dict[str, sqlalchemy.Column]:
+        """
+        Get the columns of the model by name.
+        """
+        columns = sqlalchemy.inspect(self.model).columns
+
+        return {column.name: column for column in columns}
+
+    def _get_model_column(self, name: str) -> sqlalchemy.Column:
+        try:
+            return self.get_model_columns()[name]
+        except KeyError:
+            raise KeyError(
+                f"The filter or sort name `{name}`"
+                " does not match any column"
+                f" of the SQLAlchemy model `{self.model.__name__}`."
+            )
+
+    def _check_indexes(self) -> None:
+        """
+        Warn about filter and sort columns without an index, once for each view class.
+        """
+        view_class = type(self)
+
+        if view_class in _index_checked_view_classes:
+            return
+
+        _index_checked_view_classes.add(view_class)
+
+        for name in dict.fromkeys([*self.filter_fields, *self.sort_fields]):
+            if not is_column_indexed(self._get_model_column(name)):
+                warnings.warn(
+                    f"The filter or sort column `{name}`"
+                    f" of the SQLAlchemy model `{self.model.__name__}`"
+                    f" used by the view `{view_class.__name__}` has no index."
+                )
+
+    def coerce_filter_value(self, column: sqlalchemy.Column, value: str) -> typing.Any:
+        """
+        Coerce a query argument value to the Python type of the column.
+        """
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+
+        if python_type is bool:
+            if value.lower() not in ("true", "false"):
+                raise ValueError(f"`{value}` is not a boolean.")
+
+            return value.lower() == "true"
+
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            return python_type.fromisoformat(value)
+
+        return python_type(value)
+
+    def get_filter_clauses(self) -> list:
+        """
+        Get the SQL filter clauses from the request query arguments.
+        """
+        filter_clauses = []
+
+        for argument, values in flask.request.args.lists():
+            name, _, operator_name = argument.partition(OPERATOR_SEPARATOR)
+            operator_name = operator_name or "eq"
+
+            if name not in self.filter_fields:
+                continue
+
+            if operator_name not in self.filter_fields[name] or operator_name not in OPERATORS:
+                flask.abort(400, f"The operator `{operator_name}` is not allowed for `{name}`.")
+
+            column = self._get_model_column(name)
+
+            try:
+                if operator_name == "in":
+                    filter_values = [
+                        [self.coerce_filter_value(column, item) for item in value.split(",")]
+                        for value in values
+                    ]
+                else:
+                    filter_values = [self.coerce_filter_value(column, value) for value in values]
+            except (TypeError, ValueError, decimal.InvalidOperation):
+                flask.abort(400, f"The value of `{argument}` is not valid.")
+
+            for filter_value in filter_values:
+                filter_clauses.append(OPERATORS[operator_name](column, filter_value))
+
+        return filter_clauses
+
+    def get_order_by_clauses(self) -> list:
+        """
+        Get the SQL order-by clauses from the sort query argument.
+
+        If the model instances are sorted or paginated,
+        the primary-key columns are appended so that the order is deterministic
+        and pages do not repeat or skip model instances.
+        """
+        sort_names = [
+            sort_name
+            for value in flask.request.args.getlist(self.sort_argument)
+            for sort_name in value.split(",")
+            if sort_name
+        ] or self.default_sort
+
+        order_by_clauses = []
+
+        for sort_name in sort_names:
+            name = sort_name.removeprefix("-")
+
+            if name not in self.sort_fields:
+                flask.abort(400, f"Sorting by `{name}` is not allowed.")
+
+            column = self._get_model_column(name)
+            order_by_clauses.append(column.desc() if sort_name.startswith("-") else column.asc())
+
+        if sort_names or self.page_size is not None:
+            order_by_clauses.extend(sqlalchemy.inspect(self.model).primary_key)
+
+        return order_by_clauses
+
+    def get_model_select(self) -> sqlalchemy.Select:
+        """
+        Get the select statement for the filtered and sorted model instances.
+        """
+        if flask.current_app.debug:
+            self._check_indexes()
+
+        return (
+            sqlalchemy.select(self.model)
+            .where(*self.get_filter_clauses())
+            .order_by(*self.get_order_by_clauses())
+        )
+
+    def get_page(self) -> int:
+        """
+        Get the one-based page number from the page query argument.
+        """
+        page = flask.request.args.get(self.page_argument, 1, type=int)
+
+        if page < 1:
+            flask.abort(400, f"The value of `{self.page_argument}` is not valid.")
+
+        return page
+
+    def get_page_select(self, select: sqlalchemy.Select) -> sqlalchemy.Select:
+        """
+        Limit the select statement to the requested page, if the view paginates.
+        """
+        if self.page_size is None:
+            return select
+
+        return select.limit(self.page_size).offset((self.get_page() - 1) * self.page_size)
@@ -0,0 +1,71 @@
+"""
+Warm up a Flask app at startup, before its first request.
+"""
+
+import typing
+
+import flask
+import sqlalchemy.orm
+import wtforms
+
+from fsw.forms.choices import ForeignKeySelectField
+from fsw.forms.models import get_model_forms
+from fsw.views.forms import FormView
+
+
+def get_view_form_classes(app: flask.Flask) -> list[typing.Type[wtforms.Form]]:
+    """
+    Get the form classes of the form views registered in the Flask app.
+    """
+    form_classes = []
+
+    for view in app.view_functions.values():
+        view_class = getattr(view, "view_class", None)
+
+        if isinstance(view_class, type) and issubclass(view_class, FormView):
+            form_class = getattr(view_class, "form_class", None)
+
+            if form_class is not None and form_class not in form_classes:
+                form_classes.append(form_class)
+
+    return form_classes
+
+
+def warm_up(app: flask.Flask) -> None:
+    """
+    Configure the SQLAlchemy mappers, and build every model form
+    and every form class of the form views in the Flask app,
+    so that the first request after startup does not pay for them.
+
+    WTForms binds the fields of a form class when the class is first instantiated,
+    so each form class is instantiated once, without CSRF protection,
+    in a test request context of the app.
+
+    Instantiating forms with foreign-key fields runs database queries
+    to load and cache their choices.
+    The database sessions of those fields are removed afterwards,
+    so that the startup process does not keep a connection or transaction open,
+    such as one inherited by the workers of a pre-forking server.
+    Call this function after the views are registered and the database is available.
+    """
+    sqlalchemy.orm.configure_mappers()
+
+    form_classes = [*get_model_forms(), *get_view_form_classes(app)]
+    database_sessions = []
+
+    with app.test_request_context():
+        for form_class in dict.fromkeys(form_classes):
+            form = form_class(meta={"csrf": False})
+
+            for field in form:
+                if isinstance(field, ForeignKeySelectField):
+                    database_session = field.choice_loader.database_session
+
+                    if database_session not in database_sessions:
+                        database_sessions.append(database_session)
+
+    for database_session in database_sessions:
+        if isinstance(database_session, sqlalchemy.orm.scoped_session):
+            database_session.remove()
+        else:
+            database_session.close()
@@ -0,0 +1,152 @@
+"""
+Tests that validation plans give the same data and errors as validating each form.
+"""
+
+import datetime
+import itertools
+import random
+
+import pytest
+import sqlalchemy
+import sqlalchemy.orm
+import wtforms
+
+from fsw.forms.batch import ValidationPlan
+from fsw.forms.batch import _RecordFormData
+from fsw.forms.models import ForeignKeyColumnFieldConverter
+from fsw.forms.models import ModelFormMixin
+
+
+class Base(sqlalchemy.orm.DeclarativeBase):
+    pass
+
+
+class Author(Base):
+    __tablename__ = "author"
+
+    id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
+    name: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(sqlalchemy.String(50))
+
+
+class Book(Base):
+    __tablename__ = "book"
+
+    id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
+    title: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(sqlalchemy.String(5))
+    note: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column(sqlalchemy.Text)
+    pages: sqlalchemy.orm.Mapped[int | None]
+    published_on: sqlalchemy.orm.Mapped[datetime.date]
+    published_at: sqlalchemy.orm.Mapped[datetime.datetime | None]
+    is_available: sqlalchemy.orm.Mapped[bool]
+    kind: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(sqlalchemy.Enum("a", "b"))
+    author_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.ForeignKey("author.id")
+    )
+    editor_id: sqlalchemy.orm.Mapped[int | None] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.ForeignKey("author.id")
+    )
+
+
+SUBMITTED_VALUES = {
+    "title": ["", " ", "abc", "abcdefg", 0],
+    "note": ["", " ", "note"],
+    "pages": ["", "1", "x", 0, 5],
+    "published_on": ["", "2024-01-02", "2024-13-01"],
+    "published_at": ["", "2024-01-02T03:04", "yesterday"],
+    "is_available": ["", "y", "false", False, True],
+    "kind": ["", "a", "c"],
+    "author_id": ["", "1", "9", "x"],
+    "editor_id": ["", "2", "9"],
+}
+
+
+def validate_forms(form_class, records):
+    """
+    Validate each record by instantiating the form.
+    """
+    results = []
+
+    for record in records:
+        form = form_class(_RecordFormData(record), meta={"csrf": False})
+        form.validate()
+        results.append((form.data, form.errors))
+
+    return results
+
+
+@pytest.fixture
+def database_session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    database_session = sqlalchemy.orm.scoped_session(sqlalchemy.orm.sessionmaker(engine))
+    database_session.add_all([Author(name=name) for name in "xyz"])
+    database_session.commit()
+
+    yield database_session
+
+    database_session.remove()
+
+
+@pytest.mark.parametrize("max_choices", [500, 2])
+def test_plan_matches_forms(database_session, max_choices):
+    class Form(ModelFormMixin, wtforms.Form):
+        foreign_key_converter = ForeignKeyColumnFieldConverter(
+            database_session,
+            max_choices=max_choices,
+        )
+
+    form_class = Form.get_model_form(Book, list(SUBMITTED_VALUES))
+    plan = ValidationPlan(form_class)
+    assert plan.field_plans is not None
+
+    generator = random.Random(0)
+    records = [
+        {
+            name: value
+            for name, values in SUBMITTED_VALUES.items()
+            if (value := generator.choice([*values, None])) is not None
+        }
+        for _ in range(2000)
+    ]
+
+    assert plan.validate(records) == validate_forms(form_class, records)
+
+
+def test_plan_calls_callable_defaults_for_each_record():
+    counters = [itertools.count(1)]
+
+    class Form(wtforms.Form):
+        number = wtforms.IntegerField(default=lambda: next(counters[0]))
+
+    records = [{}, {}, {}]
+    plan = ValidationPlan(Form)
+
+    counters[0] = itertools.count(1)
+    results = plan.validate(records)
+    counters[0] = itertools.count(1)
+
+    assert [data["number"] for data, _ in results] == [1, 2, 3]
+    assert results == validate_forms(Form, records)
+
+
+def test_plan_copies_mutable_defaults():
+    class Form(wtforms.Form):
+        tags = wtforms.StringField(default=[])
+
+    data, _ = zip(*ValidationPlan(Form).validate([{}, {}]))
+
+    assert data[0]["tags"] == data[1]["tags"] == []
+    assert data[0]["tags"] is not data[1]["tags"]
+
+
+def test_plan_runs_inline_validators():
+    class Form(wtforms.Form):
+        title = wtforms.StringField(validators=[wtforms.validators.Optional()])
+
+        def validate_title(form, field):
+            raise wtforms.validators.ValidationError("Invalid title.")
+
+    records = [{"title": "abc"}]
+
+    assert ValidationPlan(Form).validate(records) == validate_forms(Form, records)
+    assert ValidationPlan(Form).validate(records)[0][1] == {"title": ["Invalid title."]}
@@ -0,0 +1,48 @@
+"""
+Tests that the converter registry resolves column types to converters.
+"""
+
+import pytest
+import sqlalchemy
+
+from fsw.forms.models import ColumnFieldConverterRegistry
+from fsw.forms.models import IntegerColumnFieldConverter
+from fsw.forms.models import StringColumnFieldConverter
+
+
+class LowercaseString(sqlalchemy.types.TypeDecorator):
+    impl = sqlalchemy.String(20)
+    cache_ok = True
+
+
+class LargeNumber(sqlalchemy.types.TypeDecorator):
+    impl = sqlalchemy.BigInteger
+    cache_ok = True
+
+
+@pytest.fixture
+def converters():
+    return ColumnFieldConverterRegistry(
+        {
+            sqlalchemy.String: StringColumnFieldConverter(),
+            sqlalchemy.Integer: IntegerColumnFieldConverter(),
+        }
+    )
+
+
+def test_resolve_subclasses(converters):
+    assert converters.resolve(sqlalchemy.Text) is converters[sqlalchemy.String]
+    assert converters.resolve(sqlalchemy.BigInteger) is converters[sqlalchemy.Integer]
+
+
+def test_resolve_type_decorators(converters):
+    assert converters.resolve(LowercaseString) is converters[sqlalchemy.String]
+    assert converters.resolve(LargeNumber) is converters[sqlalchemy.Integer]
+
+
+def test_resolve_after_changes(converters):
+    converters.resolve(sqlalchemy.Text)
+    converters.pop(sqlalchemy.String)
+
+    with pytest.raises(KeyError):
+        converters.resolve(sqlalchemy.Text)
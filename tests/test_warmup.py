@@ -0,0 +1,48 @@
+"""
+Tests that warming up the app builds forms without leaving database sessions open.
+"""
+
+import flask
+import sqlalchemy
+import sqlalchemy.orm
+import wtforms
+
+from fsw.forms.models import ForeignKeyColumnFieldConverter
+from fsw.forms.models import ModelFormMixin
+from fsw.warmup import warm_up
+
+
+class Base(sqlalchemy.orm.DeclarativeBase):
+    pass
+
+
+class Author(Base):
+    __tablename__ = "author"
+
+    id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
+    name: sqlalchemy.orm.Mapped[str]
+
+
+class Book(Base):
+    __tablename__ = "book"
+
+    id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(primary_key=True)
+    author_id: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.ForeignKey("author.id")
+    )
+
+
+def test_warm_up_removes_database_sessions():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    database_session = sqlalchemy.orm.scoped_session(sqlalchemy.orm.sessionmaker(engine))
+
+    class Form(ModelFormMixin, wtforms.Form):
+        foreign_key_converter = ForeignKeyColumnFieldConverter(database_session)
+
+    form_class = Form.get_model_form(Book, ["author_id"])
+
+    warm_up(flask.Flask(__name__))
+
+    assert form_class._unbound_fields is not None
+    assert not database_session.registry.has()